@@ -32,7 +32,9 @@ BOX_POS = {
     Box.TRINKET2:      (395, 15),
 }
 
-# Grab region covering all boxes (single row, 1px tall)
+# Grab region covering all boxes (single row, 1px tall).
+# Each box is sampled as exactly one pixel — the WAs are 1x1 solid-color
+# textures, so there is no NxN averaging and nothing to anti-alias.
 _xs = [p[0] for p in BOX_POS.values()]
 STRIP = {
     "left": min(_xs),
@@ -62,8 +64,14 @@ CD_BOXES = {
     Box.TRINKET2:      "f9",
 }
 
+# Capture backend: "dxcam" = DXGI Desktop Duplication (Windows, ~1-3ms/grab),
+# "mss" = BitBlt/GDI (cross-platform, ~15ms/grab), "auto" = dxcam if installed.
+CAPTURE_BACKEND = "auto"
+
 # Timing
 POLL_RATE = 0.008
+IDLE_RATE = 0.05        # backoff once the desktop has been static a while
+IDLE_AFTER = 25         # consecutive unchanged polls (~0.2s) before backoff
 DEBOUNCE_FRAMES = 2
 REPRESS_INTERVAL = 0.5
 
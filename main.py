@@ -7,23 +7,40 @@ Reads 8 WeakAura color boxes (vertical layout) and presses the right ability:
   YELLOW -> Arcane/Multi weave (instants + Multi if MULTI_OK)
   RED    -> wait (<0.1s to swing)
 
-Requirements: pip install mss pydirectinput pystray Pillow keyboard
+Requirements: pip install mss numpy pydirectinput pystray Pillow keyboard
+Optional: pip install dxcam (low-latency DXGI capture on Windows)
+          pip install numba (JIT-compiled pixel classification)
 """
 
 import argparse
 import mss
+import numpy as np
+import queue
+import sys
 import time
 import threading
+from collections import deque
 from enum import Enum
 from PIL import Image
 import pystray
 import pydirectinput
 import keyboard
 
+try:
+    import dxcam  # DXGI Desktop Duplication — Windows only, optional
+except ImportError:
+    dxcam = None
+
+try:
+    import numba  # JIT-compiled classification kernel, optional
+except ImportError:
+    numba = None
+
 from config import (
     Box, BOX_POS, STRIP,
     ON_THRESHOLD, OFF_MAX, KEYS, CD_BOXES,
-    POLL_RATE, DEBOUNCE_FRAMES, REPRESS_INTERVAL,
+    CAPTURE_BACKEND, POLL_RATE, IDLE_RATE, IDLE_AFTER,
+    DEBOUNCE_FRAMES, REPRESS_INTERVAL,
     QUIT_KEY, CALIBRATE_KEY, PRESETS,
 )
 
@@ -41,9 +58,13 @@ class Color(Enum):
     UNKNOWN = "UNKNOWN"
 
 
-def classify(r: int, g: int, b: int) -> Color:
-    """Classify an RGB triple into a WA color."""
-    on, off = ON_THRESHOLD, OFF_MAX
+def classify(r: int, g: int, b: int,
+             on: int = ON_THRESHOLD, off: int = OFF_MAX) -> Color:
+    """Classify an RGB triple into a WA color.
+
+    Thresholds are bound as defaults at definition time to skip the
+    module-global lookups on every call.
+    """
     if r > on and g > on and b < off:
         return Color.YELLOW
     if g > on and r < off and b < off:
@@ -59,37 +80,139 @@ def classify(r: int, g: int, b: int) -> Color:
     return Color.UNKNOWN
 
 
+# 15-bit RGB lookup table (5 bits per channel): one array index replaces
+# the whole comparison chain above. Built once from classify() itself so
+# the thresholds stay defined in one place. Quantization snaps thresholds
+# to 8-value steps — irrelevant for the pure 0/255 WA colors.
+_COLORS = tuple(Color)
+_BOXES = tuple(Box)
+_LUT = np.empty(32768, dtype=np.uint8)
+for _i in range(32768):
+    _rgb = ((_i >> 10) * 8 + 4, ((_i >> 5) & 31) * 8 + 4, (_i & 31) * 8 + 4)
+    _LUT[_i] = _COLORS.index(classify(*_rgb))
+
+
+if numba is not None:
+    @numba.njit(cache=True, nogil=True)
+    def _classify_ords(px, lut, out):
+        # LUT gather without the astype/temporary arrays of the NumPy
+        # path; nogil=True releases the GIL for the compiled loop and
+        # cache=True keeps the compile a one-time cost.
+        for i in range(px.shape[0]):
+            r = np.int32(px[i, 2]) >> 3
+            g = np.int32(px[i, 1]) >> 3
+            b = np.int32(px[i, 0]) >> 3
+            out[i] = lut[(r << 10) | (g << 5) | b]
+else:
+    _classify_ords = None
+
+_ORD_BUF = np.empty(len(Box), dtype=np.uint8)
+
+
+def classify_all(px: np.ndarray) -> dict[Box, Color]:
+    """Classify all box pixels at once via the LUT (px is (n, 4) BGRA)."""
+    if _classify_ords is not None:
+        _classify_ords(px, _LUT, _ORD_BUF)
+        ords = _ORD_BUF
+    else:
+        p = px.astype(np.int32)
+        idx = ((p[:, 2] >> 3) << 10) | ((p[:, 1] >> 3) << 5) | (p[:, 0] >> 3)
+        ords = _LUT[idx]
+    return {box: _COLORS[o] for box, o in zip(_BOXES, ords)}
+
+
 # ------------------------------------------------------------------
 # Screen reading — single grab, raw buffer
 # ------------------------------------------------------------------
-def read_all(sct: mss.mss) -> dict[Box, Color]:
-    """Grab the vertical strip once and classify each box."""
-    img = sct.grab(STRIP)
-    raw = img.raw  # BGRA bytes, row-major
-    stride = STRIP["width"] * 4
-    colors = {}
-    for box in Box:
-        sx, sy = BOX_POS[box]
-        lx, ly = sx - STRIP["left"], sy - STRIP["top"]
-        offset = ly * stride + lx * 4
-        b, g, r = raw[offset], raw[offset + 1], raw[offset + 2]
-        colors[box] = classify(r, g, b)
-    return colors
+# Flat byte offset of each box's BGRA quad inside the strip, precomputed
+# once so a grab reduces to a single np.take into a reused buffer.
+_STRIDE = STRIP["width"] * 4
+_FLAT_IDX = np.array(
+    [(BOX_POS[box][1] - STRIP["top"]) * _STRIDE
+     + (BOX_POS[box][0] - STRIP["left"]) * 4 + c
+     for box in Box for c in range(4)]
+)
+_PX_BUF = np.empty((len(Box), 4), dtype=np.uint8)
+
+
+def make_grabber():
+    """Build the capture backend and return a zero-arg grabber.
+
+    The grabber yields the (n_boxes, 4) BGRA uint8 buffer, or None when
+    the backend reports no new frame (dxcam only — DXGI delivers frames
+    as the desktop changes, so None means the WA boxes can't have moved).
+    The chosen backend name is exposed as grab.backend.
+    """
+    if dxcam is not None and CAPTURE_BACKEND in ("auto", "dxcam"):
+        try:
+            # create() raises — or returns None — when Desktop Duplication
+            # is unavailable (RDP session, headless, wrong GPU adapter).
+            camera = dxcam.create(output_color="BGRA")
+        except Exception:
+            camera = None
+
+        if camera is None:
+            print("[WARN] dxcam could not initialize — falling back to mss")
+        else:
+            region = (STRIP["left"], STRIP["top"],
+                      STRIP["left"] + STRIP["width"],
+                      STRIP["top"] + STRIP["height"])
+
+            def grab() -> np.ndarray | None:
+                frame = camera.grab(region=region)
+                if frame is None:  # desktop unchanged since last grab
+                    return None
+                np.take(frame.reshape(-1), _FLAT_IDX, out=_PX_BUF.reshape(-1))
+                return _PX_BUF
+
+            grab.backend = "dxcam"
+            return grab
+    elif CAPTURE_BACKEND == "dxcam":
+        print("[WARN] dxcam not installed — falling back to mss")
+
+    sct = mss.mss()
+
+    def grab() -> np.ndarray | None:
+        flat = np.frombuffer(sct.grab(STRIP).raw, dtype=np.uint8)
+        np.take(flat, _FLAT_IDX, out=_PX_BUF.reshape(-1))
+        return _PX_BUF
+
+    grab.backend = "mss"
+    return grab
 
 
-def read_all_rgb(sct: mss.mss) -> dict[Box, tuple[int, int, int]]:
+# Change detection: a delivered frame usually means something *elsewhere*
+# on the desktop changed — the 48 strip bytes are compared against the
+# previous grab and classification is skipped when they are identical.
+_LAST_PX = np.zeros_like(_PX_BUF)
+_LAST_COLORS: dict[Box, Color] | None = None
+
+
+def read_all(grab) -> dict[Box, Color] | None:
+    """Grab the strip once and classify each box (None = no new frame).
+
+    Reuses the previous classification when the box pixels are
+    byte-identical, so classify runs at the WA's actual blink rate
+    instead of the poll rate.
+    """
+    global _LAST_COLORS
+    px = grab()
+    if px is None:
+        return None
+    if _LAST_COLORS is not None and np.array_equal(px, _LAST_PX):
+        return _LAST_COLORS
+    _LAST_PX[:] = px
+    _LAST_COLORS = classify_all(px)
+    return _LAST_COLORS
+
+
+def read_all_rgb(grab) -> dict[Box, tuple[int, int, int]] | None:
     """Like read_all but returns raw (R, G, B) tuples for calibration."""
-    img = sct.grab(STRIP)
-    raw = img.raw
-    stride = STRIP["width"] * 4
-    result = {}
-    for box in Box:
-        sx, sy = BOX_POS[box]
-        lx, ly = sx - STRIP["left"], sy - STRIP["top"]
-        offset = ly * stride + lx * 4
-        b, g, r = raw[offset], raw[offset + 1], raw[offset + 2]
-        result[box] = (r, g, b)
-    return result
+    px = grab()
+    if px is None:
+        return None
+    return {box: (int(p[2]), int(p[1]), int(p[0]))
+            for box, p in zip(_BOXES, px)}
 
 
 # ------------------------------------------------------------------
@@ -121,6 +244,80 @@ def decide_action(colors: dict[Box, Color], simple: bool = False,
     return None
 
 
+# ------------------------------------------------------------------
+# Key output — direct SendInput with prebuilt INPUT structs
+# ------------------------------------------------------------------
+# pydirectinput.press() does a mapping lookup, failsafe check and struct
+# build on every call. The structs only depend on the key, so build them
+# once and hand them straight to SendInput.
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    _PUL = ctypes.POINTER(ctypes.c_ulong)
+    _KEYEVENTF_SCANCODE = 0x0008
+    _KEYEVENTF_KEYUP = 0x0002
+    _INPUT_KEYBOARD = 1
+
+    class _KEYBDINPUT(ctypes.Structure):
+        _fields_ = (("wVk", wintypes.WORD), ("wScan", wintypes.WORD),
+                    ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD),
+                    ("dwExtraInfo", _PUL))
+
+    class _MOUSEINPUT(ctypes.Structure):
+        # Unused, but INPUT's size is that of its largest union member.
+        _fields_ = (("dx", wintypes.LONG), ("dy", wintypes.LONG),
+                    ("mouseData", wintypes.DWORD), ("dwFlags", wintypes.DWORD),
+                    ("time", wintypes.DWORD), ("dwExtraInfo", _PUL))
+
+    class _INPUT(ctypes.Structure):
+        class _U(ctypes.Union):
+            _fields_ = (("mi", _MOUSEINPUT), ("ki", _KEYBDINPUT))
+        _anonymous_ = ("u",)
+        _fields_ = (("type", wintypes.DWORD), ("u", _U))
+
+    _SendInput = ctypes.windll.user32.SendInput
+    _KEY_INPUTS: dict[str, tuple] = {}
+
+    def _inputs_for(key: str):
+        pair = _KEY_INPUTS.get(key)
+        if pair is None:
+            scan = pydirectinput.KEYBOARD_MAPPING[key]
+            down = _INPUT(type=_INPUT_KEYBOARD, ki=_KEYBDINPUT(
+                0, scan, _KEYEVENTF_SCANCODE, 0, None))
+            up = _INPUT(type=_INPUT_KEYBOARD, ki=_KEYBDINPUT(
+                0, scan, _KEYEVENTF_SCANCODE | _KEYEVENTF_KEYUP, 0, None))
+            pair = _KEY_INPUTS[key] = (down, up)
+        return pair
+
+    def press(key: str):
+        """Tap a key: two SendInput calls on cached down/up structs."""
+        down, up = _inputs_for(key)
+        _SendInput(1, ctypes.byref(down), ctypes.sizeof(down))
+        _SendInput(1, ctypes.byref(up), ctypes.sizeof(up))
+else:
+    press = pydirectinput.press
+
+
+# ------------------------------------------------------------------
+# Logging — drained off the capture thread
+# ------------------------------------------------------------------
+# print() can block for tens of ms when the console is scrolled or the
+# stream is redirected; the hot loop queues lines instead and a daemon
+# thread does the actual writing.
+_LOG_Q: queue.SimpleQueue = queue.SimpleQueue()
+
+
+def log(msg: str):
+    """Queue a line for the printer thread — never blocks the caller."""
+    _LOG_Q.put(msg)
+
+
+def _printer():
+    while True:
+        print(_LOG_Q.get(), flush=True)
+
+
 # ------------------------------------------------------------------
 # App state
 # ------------------------------------------------------------------
@@ -132,21 +329,26 @@ class Mode(Enum):
 
 
 class AppState:
+    __slots__ = ("mode", "running", "calibrating",
+                 "history", "confirmed_action")
+
     def __init__(self):
+        # running/calibrating are plain bools written by single owners
+        # (hotkey hook thread) and read by the loop; single attribute
+        # loads/stores are atomic under the GIL, so no lock is needed.
         self.mode = Mode.OFF
         self.running = True
         self.calibrating = False
-        self.lock = threading.Lock()
-        # Debounce
-        self.pending_action: str | None = None
-        self.debounce_count = 0
+        # Debounce: ring of the last N per-frame actions; a change is
+        # confirmed only when the whole ring agrees (count() is a C scan).
+        self.history: deque[str | None] = deque(maxlen=DEBOUNCE_FRAMES)
         self.confirmed_action: str | None = None
 
 
 # ------------------------------------------------------------------
 # Calibration
 # ------------------------------------------------------------------
-def calibrate(sct: mss.mss, state: AppState):
+def calibrate(grab, state: AppState):
     print("\n=== CALIBRATION MODE (F8 to exit) ===")
     for box in Box:
         sx, sy = BOX_POS[box]
@@ -154,21 +356,30 @@ def calibrate(sct: mss.mss, state: AppState):
     print()
 
     while True:
-        with state.lock:
-            if not state.calibrating:
-                print("\n=== EXITED CALIBRATION ===")
-                return
-
-        rgbs = read_all_rgb(sct)
-        colors = {box: classify(*rgb) for box, rgb in rgbs.items()}
-        parts = [f"{box.name}={colors[box].value:7s}" for box in Box]
-        print(f"\r  {'  '.join(parts)}", end="", flush=True)
+        if not state.calibrating:
+            print("\n=== EXITED CALIBRATION ===")
+            return
+
+        rgbs = read_all_rgb(grab)
+        if rgbs is not None:
+            colors = {box: classify(*rgb) for box, rgb in rgbs.items()}
+            parts = [f"{box.name}={colors[box].value:7s}" for box in Box]
+            print(f"\r  {'  '.join(parts)}", end="", flush=True)
         time.sleep(0.1)
 
 
 # ------------------------------------------------------------------
 # Tray icon
 # ------------------------------------------------------------------
+# One image per mode, built at import — the only PIL work in the program.
+_TRAY_IMAGES = {
+    Mode.OFF: Image.new("RGB", (64, 64), "gray"),
+    Mode.SIMPLE: Image.new("RGB", (64, 64), "yellow"),
+    Mode.FULL: Image.new("RGB", (64, 64), "green"),
+    Mode.CLEAVE: Image.new("RGB", (64, 64), "orange"),
+}
+
+
 def create_tray(state: AppState) -> pystray.Icon:
     def on_quit(icon, _item):
         state.running = False
@@ -176,13 +387,28 @@ def create_tray(state: AppState) -> pystray.Icon:
 
     icon = pystray.Icon(
         "wow-autoshot",
-        Image.new("RGB", (64, 64), "gray"),
+        _TRAY_IMAGES[Mode.OFF],
         "AutoShot: OFF",
         pystray.Menu(pystray.MenuItem("Quit (F7)", on_quit)),
     )
+    icon._last_mode = Mode.OFF
     return icon
 
 
+def update_tray(icon: pystray.Icon, mode: Mode):
+    """Show the current mode as the tray color.
+
+    Assigning icon.icon marshals to the tray thread, so skip everything
+    unless the mode actually changed; the swap itself is just a pointer
+    assignment to a prebuilt image.
+    """
+    if mode == icon._last_mode:
+        return
+    icon._last_mode = mode
+    icon.icon = _TRAY_IMAGES[mode]
+    icon.title = f"AutoShot: {mode.value}"
+
+
 # ------------------------------------------------------------------
 # Hotkeys
 # ------------------------------------------------------------------
@@ -198,21 +424,171 @@ def poll_mode(preset: dict) -> Mode:
 
 
 def start_hotkeys(state: AppState):
+    """Register global hotkeys. Callbacks run on the keyboard library's
+    own hook thread — no dedicated listener thread or sentinel loop."""
     def quit_app():
-        print("\n[QUIT]")
+        log("\n[QUIT]")
         state.running = False
 
     def toggle_calibrate():
-        with state.lock:
-            state.calibrating = not state.calibrating
+        state.calibrating = not state.calibrating
 
     keyboard.add_hotkey(QUIT_KEY, quit_app)
     keyboard.add_hotkey(CALIBRATE_KEY, toggle_calibrate)
 
 
+# ------------------------------------------------------------------
+# Capture loop — debounced and immediate variants, picked at startup
+# ------------------------------------------------------------------
+def _new_timers() -> dict:
+    """Press/log bookkeeping carried across a loop's frames."""
+    return {"press": 0, "kc": 0,
+            "cd": {box: 0 for box in CD_BOXES},
+            "log": object()}  # sentinel: never matches an action
+
+
+def _next_frame(grab, preset, state, tray, colors):
+    """Per-frame prologue shared by both loop variants: calibration, mode
+    polling and the strip read. Returns (colors, action, fresh), or None
+    when the frame does no rotation work (calibration, OFF mode, or no
+    frame yet — any needed sleep already happened here)."""
+    if state.calibrating:
+        calibrate(grab, state)
+        return None
+
+    # Mode check (polled directly, not event-based)
+    mode = poll_mode(preset)
+    update_tray(tray, mode)
+    if mode == Mode.OFF:
+        time.sleep(0.05)
+        return None
+
+    # Read + decide (fresh None = no new frame — keep last classification
+    # so re-press/steady-spam timing still runs)
+    fresh = read_all(grab)
+    if fresh is not None:
+        colors = fresh
+    elif colors is None:
+        time.sleep(POLL_RATE)
+        return None
+    action = decide_action(colors, simple=(mode == Mode.SIMPLE),
+                           allow_multi=(mode != Mode.CLEAVE))
+    return colors, action, fresh
+
+
+def _service_frame(colors, action, preset, state, t):
+    """Act on a confirmed action: log the edge, pop cooldowns, weave Kill
+    Command, and press the rotation key with re-press pacing."""
+    if action != state.confirmed_action:
+        state.confirmed_action = action
+        t["press"] = 0  # press immediately on change
+
+        # Log state change
+        if action != t["log"]:
+            auto_c = colors[Box.AUTO].value
+            if action:
+                log(f"[{auto_c:7s}] -> press {KEYS[action]} ({action})")
+            else:
+                log(f"[{auto_c:7s}] -> wait")
+            t["log"] = action
+
+    # Cooldowns — press when F held + WA box shows PINK (off CD)
+    now = time.time()
+    if preset["USE_CDS"] and preset["HOLD_CD_KEY"] and keyboard.is_pressed(preset["HOLD_CD_KEY"]):
+        for cd_box, cd_key in CD_BOXES.items():
+            if (colors[cd_box] == Color.PINK
+                    and now - t["cd"][cd_box] >= REPRESS_INTERVAL):
+                press(cd_key)
+                t["cd"][cd_box] = now
+                break  # one CD per loop to avoid input flood
+
+    # Kill Command — off-GCD, press whenever available + not casting
+    if (colors[Box.KILL_CMD] == Color.BLUE
+            and colors[Box.STEADY] != Color.YELLOW
+            and now - t["kc"] >= REPRESS_INTERVAL):
+        press(KEYS["kill_cmd"])
+        t["kc"] = now
+
+    # Press key (with re-press interval)
+    # Spam steady until cast confirms (STEADY turns YELLOW)
+    if action == "steady" and colors[Box.STEADY] != Color.YELLOW:
+        interval = POLL_RATE
+    else:
+        interval = REPRESS_INTERVAL
+    if action and now - t["press"] >= interval:
+        press(KEYS[action])
+        t["press"] = now
+
+
+def _run_loop_debounced(grab, preset, state, tray):
+    """Capture loop with the N-frame ring-buffer debounce."""
+    colors: dict[Box, Color] | None = None
+    t = _new_timers()
+    history = state.history
+    idle_streak = 0
+    while state.running:
+        frame = _next_frame(grab, preset, state, tray, colors)
+        if frame is None:
+            continue
+        colors, action, fresh = frame
+        idle_streak = idle_streak + 1 if fresh is None else 0
+
+        # Debounce — fire only when the last N frames agree
+        history.append(action)
+        if (len(history) == DEBOUNCE_FRAMES
+                and history.count(action) == DEBOUNCE_FRAMES):
+            _service_frame(colors, action, preset, state, t)
+
+        # Idle backoff: only after IDLE_AFTER consecutive unchanged polls
+        # — a single None grab just means dxcam composited no frame in
+        # the last 8ms (every other poll at 60fps), not that the game is
+        # idle, and backing off then would stretch exactly the RED→GREEN
+        # and GCD-ready edges this loop exists to catch.
+        if action is None and idle_streak >= IDLE_AFTER:
+            time.sleep(IDLE_RATE)
+        else:
+            time.sleep(POLL_RATE)
+
+
+def _run_loop_immediate(grab, preset, state, tray):
+    """Specialized loop for DEBOUNCE_FRAMES == 1: every frame's action is
+    acted on directly, with no ring-buffer bookkeeping."""
+    colors: dict[Box, Color] | None = None
+    t = _new_timers()
+    idle_streak = 0
+    while state.running:
+        frame = _next_frame(grab, preset, state, tray, colors)
+        if frame is None:
+            continue
+        colors, action, fresh = frame
+        idle_streak = idle_streak + 1 if fresh is None else 0
+        _service_frame(colors, action, preset, state, t)
+        if action is None and idle_streak >= IDLE_AFTER:
+            time.sleep(IDLE_RATE)
+        else:
+            time.sleep(POLL_RATE)
+
+
 # ------------------------------------------------------------------
 # Main
 # ------------------------------------------------------------------
+def boost_priority():
+    """Raise the capture loop to ABOVE_NORMAL thread priority (Windows).
+
+    WoW itself fights for CPU; the default priority lets the scheduler
+    add up to a frame of jitter to the poll period. No-op off Windows or
+    if the call fails.
+    """
+    if sys.platform != "win32":
+        return
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        kernel32.SetThreadPriority(kernel32.GetCurrentThread(), 1)
+    except Exception:
+        pass
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("preset", nargs="?", default="bm",
@@ -222,6 +598,7 @@ def main():
     preset = PRESETS[args.preset]
 
     pydirectinput.PAUSE = 0
+    boost_priority()
     state = AppState()
 
     # Banner
@@ -246,83 +623,18 @@ def main():
     start_hotkeys(state)
     tray = create_tray(state)
     threading.Thread(target=tray.run, daemon=True).start()
+    threading.Thread(target=_printer, daemon=True).start()
 
-    sct = mss.mss()
-    last_press = 0
-    last_press_kc = 0
-    last_press_cd: dict[Box, float] = {box: 0 for box in CD_BOXES}
-    last_log_action: str | None = object()  # sentinel: never matches
+    grab = make_grabber()
+    print(f"  Capture backend: {grab.backend}")
 
     try:
-        while state.running:
-            # Calibration
-            with state.lock:
-                cal = state.calibrating
-            if cal:
-                calibrate(sct, state)
-                continue
-
-            # Mode check (polled directly, not event-based)
-            mode = poll_mode(preset)
-            if mode == Mode.OFF:
-                time.sleep(0.05)
-                continue
-
-            # Read + decide
-            colors = read_all(sct)
-            action = decide_action(colors, simple=(mode == Mode.SIMPLE),
-                                   allow_multi=(mode != Mode.CLEAVE))
-
-            # Debounce
-            if action == state.pending_action:
-                state.debounce_count += 1
-            else:
-                state.pending_action = action
-                state.debounce_count = 1
-
-            if state.debounce_count >= DEBOUNCE_FRAMES:
-                if action != state.confirmed_action:
-                    state.confirmed_action = action
-                    last_press = 0  # press immediately on change
-
-                    # Log state change
-                    if action != last_log_action:
-                        auto_c = colors[Box.AUTO].value
-                        if action:
-                            print(f"[{auto_c:7s}] -> press {KEYS[action]} ({action})")
-                        else:
-                            print(f"[{auto_c:7s}] -> wait")
-                        last_log_action = action
-
-                # Cooldowns — press when F held + WA box shows PINK (off CD)
-                now = time.time()
-                if preset["USE_CDS"] and preset["HOLD_CD_KEY"] and keyboard.is_pressed(preset["HOLD_CD_KEY"]):
-                    for cd_box, cd_key in CD_BOXES.items():
-                        if (colors[cd_box] == Color.PINK
-                                and now - last_press_cd[cd_box] >= REPRESS_INTERVAL):
-                            pydirectinput.press(cd_key)
-                            last_press_cd[cd_box] = now
-                            break  # one CD per loop to avoid input flood
-
-                # Kill Command — off-GCD, press whenever available + not casting
-                if (colors[Box.KILL_CMD] == Color.BLUE
-                        and colors[Box.STEADY] != Color.YELLOW
-                        and now - last_press_kc >= REPRESS_INTERVAL):
-                    pydirectinput.press(KEYS["kill_cmd"])
-                    last_press_kc = now
-
-                # Press key (with re-press interval)
-                # Spam steady until cast confirms (STEADY turns YELLOW)
-                if action == "steady" and colors[Box.STEADY] != Color.YELLOW:
-                    interval = POLL_RATE
-                else:
-                    interval = REPRESS_INTERVAL
-                if action and now - last_press >= interval:
-                    pydirectinput.press(KEYS[action])
-                    last_press = now
-
-            time.sleep(POLL_RATE)
-
+        # Pick the loop once: with DEBOUNCE_FRAMES == 1 the ring-buffer
+        # bookkeeping is dead weight, so run the specialized variant.
+        if DEBOUNCE_FRAMES > 1:
+            _run_loop_debounced(grab, preset, state, tray)
+        else:
+            _run_loop_immediate(grab, preset, state, tray)
     except KeyboardInterrupt:
         pass
     finally: